@@ -4,18 +4,15 @@ from matplotlib import pyplot as plt
 import seaborn as sns
 import pingouin as pg
      
-import requests
+from utils import download_if_stale, load_spikes, save_processed
 
 url = "https://uni-bonn.sciebo.de/s/mLMkb2TwbNx3Yg6"
 fname = "flash_spikes.parquet"
-response = requests.get(f"{url}/download")
-print("Downloading Data ...")
-with open(fname, "wb") as file:
-    file.write(response.content)
-print("Done!")    
+download_if_stale(f"{url}/download", fname)
 
 ## Exercise 1
-df = pd.read_parquet("flash_spikes.parquet")
+df = load_spikes()
+save_processed(df)  # later scripts load the faster feather copy
 print (df.head(5))
 print("All possible questions : 1- what is brain area?LM ")
 print("All possible questions : 2- what is unit for spike_time? Second")
@@ -4,18 +4,14 @@ from matplotlib import pyplot as plt
 import seaborn as sns
 import pingouin as pg
      
-import requests
+from utils import column_names, download_if_stale, load_spikes
 
 url = "https://uni-bonn.sciebo.de/s/mLMkb2TwbNx3Yg6"
 fname = "flash_spikes.parquet"
-response = requests.get(f"{url}/download")
-print("Downloading Data ...")
-with open(fname, "wb") as file:
-    file.write(response.content)
-print("Done!")    
+download_if_stale(f"{url}/download", fname)
 
 ## Exercise 1
-df = pd.read_parquet("flash_spikes.parquet")
+df = load_spikes(columns=["spike_time"])
 #print (df.head(5))
 #print("All possible questions : 1- what is brain area?LM ")
 #print("All possible questions : 2- what is unit for spike_time? Second")
@@ -24,7 +20,7 @@ df = pd.read_parquet("flash_spikes.parquet")
 #print ("number of row or spikes in data",df.shape) 
 
 ## Exercise 3 
-print ("name of columns", df.columns)
+print ("name of columns", column_names())
 spike_time = df["spike_time"] 
 #print (spike_time)
 first_spike = df["spike_time"].min()
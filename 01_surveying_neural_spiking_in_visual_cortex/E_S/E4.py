@@ -4,18 +4,14 @@ from matplotlib import pyplot as plt
 import seaborn as sns
 import pingouin as pg
      
-import requests
+from utils import column_names, download_if_stale, load_spikes
 
 url = "https://uni-bonn.sciebo.de/s/mLMkb2TwbNx3Yg6"
 fname = "flash_spikes.parquet"
-response = requests.get(f"{url}/download")
-print("Downloading Data ...")
-with open(fname, "wb") as file:
-    file.write(response.content)
-print("Done!")    
+download_if_stale(f"{url}/download", fname)
 
 ## Exercise 1
-df = pd.read_parquet("flash_spikes.parquet")
+df = load_spikes(columns=["brain_area"])
 #print (df.head(5))
 #print("All possible questions : 1- what is brain area?LM ")
 #print("All possible questions : 2- what is unit for spike_time? Second")
@@ -24,7 +20,7 @@ df = pd.read_parquet("flash_spikes.parquet")
 #print ("number of row or spikes in data",df.shape) 
 
 ## Exercise 3 
-print ("name of columns", df.columns)
+print ("name of columns", column_names())
 #spike_time = df["spike_time"] 
 #print (spike_time)
 #first_spike = df["spike_time"].min()
@@ -35,6 +31,6 @@ print ("name of columns", df.columns)
 ## Exercise 4
 brain_area = df["brain_area"]
 print("brain_area",brain_area)
-all_brain_area_recorded = df.brain_area.unique()
+all_brain_area_recorded = df["brain_area"].cat.categories
 print ("all_brain_area_recorded", all_brain_area_recorded)
  
@@ -3,6 +3,7 @@ import pandas as pd
 from matplotlib import pyplot as plt
 import seaborn as sns
 import pingouin as pg
+from utils import column_names, load_spikes
      
 import requests
 
@@ -15,7 +16,7 @@ import requests
 #print("Done!")    
 
 ## Exercise 1
-df = pd.read_parquet("flash_spikes.parquet")
+df = load_spikes(columns=["unit_id", "brain_area"])
 #print (df.head(5))
 #print("All possible questions : 1- what is brain area?LM ")
 #print("All possible questions : 2- what is unit for spike_time? Second")
@@ -24,7 +25,7 @@ df = pd.read_parquet("flash_spikes.parquet")
 #print ("number of row or spikes in data",df.shape) 
 
 ## Exercise 3 
-print ("name of columns", df.columns)
+print ("name of columns", column_names())
 #spike_time = df["spike_time"] 
 #print (spike_time)
 #first_spike = df["spike_time"].min()
@@ -35,10 +36,10 @@ print ("name of columns", df.columns)
 ## Exercise 4
 brain_area = df["brain_area"]
 #print("brain_area",brain_area)
-all_brain_area_recorded = df.brain_area.unique()
+all_brain_area_recorded = df["brain_area"].cat.categories
 #print ("all_brain_area_recorded", all_brain_area_recorded)
 
 ##Exercise 5
 unit =df["unit_id"]
-Total_number_of_units_recorded =  df["unit_id"].nunique()
+Total_number_of_units_recorded =  len(df["unit_id"].cat.categories)
 print("Total_number_of_units_recorded:",Total_number_of_units_recorded )
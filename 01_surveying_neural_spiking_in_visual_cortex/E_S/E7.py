@@ -3,6 +3,7 @@ import pandas as pd
 from matplotlib import pyplot as plt
 import seaborn as sns
 import pingouin as pg
+from utils import count_per_category, load_spikes
      
 import requests
 
@@ -15,7 +16,7 @@ import requests
 #print("Done!")    
 
 ## Exercise 1
-df = pd.read_parquet("flash_spikes.parquet")
+df = load_spikes(columns=["unit_id", "brain_area", "spike_time"], float32=True)
 #print (df.head(5))
 #print("All possible questions : 1- what is brain area?LM ")
 #print("All possible questions : 2- what is unit for spike_time? Second")
@@ -35,7 +36,7 @@ spike_time = df["spike_time"]
 ## Exercise 4
 brain_area = df["brain_area"]
 #print("brain_area",brain_area)
-all_brain_area_recorded = df.brain_area.unique()
+all_brain_area_recorded = df["brain_area"].cat.categories
 #print ("all_brain_area_recorded", all_brain_area_recorded)
 
 ##Exercise 5
@@ -45,9 +46,9 @@ Total_number_of_units_recorded =  len(unit)
 
 ## Exercise 6
 #print ("Total_number_of_spikes:",len(spike_time))
-spike_counts = df.groupby("unit_id")["spike_time"].count()
+spike_counts = count_per_category(df["unit_id"])
 #print(spike_counts)
 
 ## Exercise 7
-unit_recorded_in_each_brain_area = df.groupby("brain_area")["unit_id"].nunique()
+unit_recorded_in_each_brain_area = count_per_category(df.drop_duplicates("unit_id")["brain_area"])
 print("unit_recorded_in_each_brain_area:",unit_recorded_in_each_brain_area) 
@@ -0,0 +1,176 @@
+# This module is deliberately copied into each session folder so the scripts
+# there run on their own; keep download_if_stale and the session setup in sync.
+import functools
+import os
+from email.utils import formatdate
+
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import requests
+from requests.adapters import HTTPAdapter
+
+# one keep-alive connection pool, shared by parallel downloads
+session = requests.Session()
+session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+
+def download_if_stale(url, fname):
+    """
+    Download the file at `url` to `fname` unless the local copy is up to date.
+    The ETag of the last download is stored in `fname + ".etag"` and sent with
+    the request, so the server only returns the file if it has changed.
+    Arguments:
+        url (str): address of the file to download.
+        fname (str): path where the downloaded file is stored.
+    """
+    etag_file = fname + ".etag"
+    headers = {}
+    if os.path.exists(fname):
+        headers["If-Modified-Since"] = formatdate(os.path.getmtime(fname), usegmt=True)
+        if os.path.exists(etag_file):
+            with open(etag_file) as file:
+                headers["If-None-Match"] = file.read().strip()
+
+    with session.get(url, headers=headers, stream=True) as response:
+        if response.status_code == 304:
+            print(f"{fname} is up to date")
+            return
+        response.raise_for_status()
+        print("Downloading Data ...")
+        with open(fname + ".part", "wb") as file:
+            for chunk in response.iter_content(chunk_size=1 << 20):
+                file.write(chunk)
+        etag = response.headers.get("ETag")
+
+    os.replace(fname + ".part", fname)
+    if etag:
+        with open(etag_file, "w") as file:
+            file.write(etag)
+    elif os.path.exists(etag_file):
+        os.remove(etag_file)
+    print("Done!")
+
+
+def column_names(fname="flash_spikes.parquet"):
+    """
+    Get the names of the columns stored in a parquet file without reading any data.
+    Arguments:
+        fname (str): path to the parquet file.
+    Returns:
+        (list of str): the names of the columns.
+    """
+    return pq.read_schema(fname).names
+
+
+def count_per_category(values):
+    """
+    Count how often each category of a categorical series occurs.
+    Gives the same counts as grouping by the series and counting, but uses
+    a single `np.bincount` over the integer category codes.
+    Arguments:
+        values (pd.Series): series with a categorical dtype and no missing values.
+    Returns:
+        (pd.Series): number of occurrences, indexed by the categories.
+    """
+    counts = np.bincount(values.cat.codes.to_numpy(), minlength=len(values.cat.categories))
+    return pd.Series(counts, index=values.cat.categories.rename(values.name))
+
+
+def processed_path(fname="flash_spikes.parquet"):
+    """
+    Get the path of the feather file that `save_processed` writes next to `fname`.
+    The name is specific to this session because the sessions store different
+    dtypes and may share a working directory.
+    Arguments:
+        fname (str): path to the parquet file.
+    Returns:
+        (str): path to the feather file.
+    """
+    return os.path.splitext(fname)[0] + ".s01.feather"
+
+
+def _processed_is_fresh(fname):
+    processed = processed_path(fname)
+    return os.path.exists(processed) and (
+        not os.path.exists(fname) or os.path.getmtime(processed) >= os.path.getmtime(fname)
+    )
+
+
+def save_processed(spikes, fname="flash_spikes.parquet"):
+    """
+    Store the processed spike data as a feather file next to the parquet file.
+    `load_spikes` reads this file instead of the parquet file as long as it is
+    newer, which skips parquet decoding and the dtype conversions. Nothing is
+    written if the feather file is already newer than the parquet file.
+    Arguments:
+        spikes (pd.DataFrame): the full spike data, as returned by `load_spikes()`.
+        fname (str): path to the parquet file the data was loaded from.
+    """
+    if not _processed_is_fresh(fname):
+        # store plain numpy dtypes; load_spikes maps them back to pyarrow-backed storage
+        arrow_columns = {
+            col: dtype.numpy_dtype
+            for col, dtype in spikes.dtypes.items()
+            if isinstance(dtype, pd.ArrowDtype)
+        }
+        spikes.astype(arrow_columns).reset_index(drop=True).to_feather(processed_path(fname))
+
+
+def load_spikes(fname="flash_spikes.parquet", columns=None, float32=False, tmin=None, tmax=None):
+    """
+    Load the spike data, reading only the requested columns and time range from disk.
+    The time range is pushed down to the parquet reader, which skips row
+    groups whose "spike_time" statistics lie outside of it.
+    "spike_time" stays in pyarrow-backed storage without a copy to numpy.
+    The "unit_id" and "brain_area" columns are stored as categoricals so
+    grouping and comparing them works on integer codes. The result is cached,
+    so loading the same columns again in one session does not re-read the file.
+    If `save_processed` stored a feather file that is newer than `fname`, it is read
+    instead, unless a time range is given: feather files have no row group
+    statistics, so windowed loads always scan the parquet file.
+    The returned data frame is shared between calls and should not be modified in place.
+    Arguments:
+        fname (str): path to the parquet file.
+        columns (None | list of str): columns to read. If None, all columns are read.
+        float32 (bool): if True, store "spike_time" as float32 to halve its memory.
+            At a session time of ~1500 s this rounds spike times to ~0.1 ms.
+        tmin (None | float): only load spikes at or after this time in seconds.
+        tmax (None | float): only load spikes at or before this time in seconds.
+    Returns:
+        (pd.DataFrame): data frame with one row per spike.
+    """
+    if columns is not None:
+        columns = tuple(columns)
+    source, file_format = fname, "parquet"
+    if tmin is None and tmax is None and _processed_is_fresh(fname):
+        source, file_format = processed_path(fname), "feather"
+    return _load_spikes(
+        source, file_format, columns, float32, tmin, tmax, os.path.getmtime(source)
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _load_spikes(fname, file_format, columns, float32, tmin, tmax, mtime):
+    # mtime is part of the cache key so a re-downloaded file is read again
+    time_filter = None
+    if tmin is not None:
+        time_filter = ds.field("spike_time") >= tmin
+    if tmax is not None:
+        upper = ds.field("spike_time") <= tmax
+        time_filter = upper if time_filter is None else time_filter & upper
+    table = ds.dataset(fname, format=file_format).to_table(
+        columns=list(columns) if columns is not None else None, filter=time_filter
+    )
+    # keep the arrow buffers instead of copying them into numpy arrays
+    spikes = table.to_pandas(types_mapper=pd.ArrowDtype)
+    if float32 and "spike_time" in spikes.columns:
+        spikes["spike_time"] = spikes["spike_time"].astype("float32[pyarrow]")
+    if "unit_id" in spikes.columns:
+        spikes["unit_id"] = spikes["unit_id"].astype(np.int32)
+    # drop categories that have no spikes in the loaded time window
+    for col in ["unit_id", "brain_area"]:
+        if col in spikes.columns:
+            spikes[col] = spikes[col].astype("category").cat.remove_unused_categories()
+    return spikes
@@ -7,7 +7,9 @@ from scipy.stats import wilcoxon
 ## https://www.youtube.com/watch?v=2AqoK8itEFQ related to wilcoxon test
 
 ##1.Preparation
-import requests
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import download_if_stale
 
 urls = [
     "https://uni-bonn.sciebo.de/s/G64EkHoQkeZeoLm",
@@ -16,10 +18,11 @@ urls = [
 
 fnames = ["flash_stimuli.parquet", "flash_spikes.parquet"]
 
-for url, fname in zip(urls, fnames):
-    response = requests.get(f"{url}/download")
-    print("Downloading Data ...")
-    with open(fname, "wb") as file:
-        file.write(response.content)
-    print("Done!")
+with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+    futures = [
+        executor.submit(download_if_stale, f"{url}/download", fname)
+        for url, fname in zip(urls, fnames)
+    ]
+    for future in futures:
+        future.result()
     
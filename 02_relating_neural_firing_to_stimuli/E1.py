@@ -3,6 +3,7 @@ import numpy as np
 from matplotlib import pyplot as plt 
 import seaborn as sns
 from scipy.stats import wilcoxon 
+from utils import load_spikes, load_stimuli, save_processed
 #%matplotlib inline
 ## https://www.youtube.com/watch?v=2AqoK8itEFQ related to wilcoxon test
 
@@ -24,11 +25,12 @@ from scipy.stats import wilcoxon
 #    print("Done!")
 
 #### E1
-spikes = pd.read_parquet("flash_spikes.parquet")
+spikes = load_spikes()
 #print(df.head(5))
 print("Spike DataFrame containing Five rows:",spikes.head(5)) 
-stimuli = pd.read_parquet("flash_stimuli.parquet")
+stimuli = load_stimuli()
 print("Stimuli DataFrame containing ten rows:",stimuli.head(10))
+save_processed(spikes, stimuli)  # later scripts load the faster feather copies
 
 
     
@@ -3,6 +3,7 @@ import numpy as np
 from matplotlib import pyplot as plt 
 import seaborn as sns
 from scipy.stats import wilcoxon 
+from utils import load_spikes, load_stimuli
 #%matplotlib inline
 ## https://www.youtube.com/watch?v=2AqoK8itEFQ related to wilcoxon test
 
@@ -24,14 +25,14 @@ from scipy.stats import wilcoxon
 #    print("Done!")
 
 #### E1
-spikes = pd.read_parquet("flash_spikes.parquet")
+spikes = load_spikes()
 #print(df.head(5))
 #print(spikes.head(5)) 
-stimuli = pd.read_parquet("flash_stimuli.parquet")
+stimuli = load_stimuli()
 #print(stimuli.head(10))
 
 #### E2
-df = pd.merge_asof(spikes, stimuli, left_on="spike_time", right_on="start_time")
+#df = pd.merge_asof(spikes, stimuli, left_on="spike_time", right_on="start_time")
 #print(df.head(10))
 #print("Get more information about merge_asof function")
 
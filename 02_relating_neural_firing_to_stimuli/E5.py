@@ -3,6 +3,7 @@ import numpy as np
 from matplotlib import pyplot as plt 
 import seaborn as sns
 from scipy.stats import wilcoxon 
+from utils import load_spikes, load_stimuli, relative_spike_times
 #%matplotlib inline
 ## https://www.youtube.com/watch?v=2AqoK8itEFQ related to wilcoxon test
 
@@ -24,14 +25,14 @@ from scipy.stats import wilcoxon
 #    print("Done!")
 
 #### E1
-spikes = pd.read_parquet("flash_spikes.parquet")
+spikes = load_spikes()
 #print(df.head(5))
 #print(spikes.head(5)) 
-stimuli = pd.read_parquet("flash_stimuli.parquet")
+stimuli = load_stimuli()
 #print(stimuli.head(10))
 
 #### E2
-df = pd.merge_asof(spikes, stimuli, left_on="spike_time", right_on="start_time")
+#df = pd.merge_asof(spikes, stimuli, left_on="spike_time", right_on="start_time")
 #print(df.head(10))
 #print("Get more information about merge_asof function")
 
@@ -40,7 +41,7 @@ stimuli["analysis_window_start"] = stimuli["start_time"] - 0.5
 #print(stimuli.head(10))
 
 ## E4 
-df = pd.merge_asof(spikes, stimuli, left_on="spike_time", right_on= "analysis_window_start")
+#df = pd.merge_asof(spikes, stimuli, left_on="spike_time", right_on= "analysis_window_start")
 #print(df.head(20))
 
 ### ?
@@ -58,7 +59,11 @@ However, I was expected to get a value around -0.5.''')
 
 
 ## E5
-df = pd.merge_asof(spikes, stimuli, left_on="spike_time", right_on= "start_time")
-df["spike_time_start_time"] = spikes["spike_time"] - stimuli["start_time"]
-print(min(df["spike_time_start_time"]))
+spikes["spike_time_start_time"] = relative_spike_times(
+    spikes["spike_time"].to_numpy(),
+    stimuli["start_time"].to_numpy(),
+    stimuli["analysis_window_start"].to_numpy(),
+)
+df = spikes
+print(df["spike_time_start_time"].min())
     
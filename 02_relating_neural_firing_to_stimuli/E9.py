@@ -3,6 +3,7 @@ import numpy as np
 from matplotlib import pyplot as plt 
 import seaborn as sns
 from scipy.stats import wilcoxon 
+from utils import load_spikes, load_stimuli, relative_spike_times
 #%matplotlib inline
 ## https://www.youtube.com/watch?v=2AqoK8itEFQ related to wilcoxon test
 
@@ -24,14 +25,14 @@ from scipy.stats import wilcoxon
 #    print("Done!")
 
 #### E1
-spikes = pd.read_parquet("flash_spikes.parquet")
+spikes = load_spikes()
 #print(df.head(5))
 #print(spikes.head(5)) 
-stimuli = pd.read_parquet("flash_stimuli.parquet")
+stimuli = load_stimuli()
 #print(stimuli.head(10))
 
 #### E2
-df = pd.merge_asof(spikes, stimuli, left_on="spike_time", right_on="start_time")
+#df = pd.merge_asof(spikes, stimuli, left_on="spike_time", right_on="start_time")
 #print(df.head(10))
 #print("Get more information about merge_asof function")
 
@@ -40,11 +41,16 @@ stimuli["analysis_window_start"] = stimuli["start_time"] - 0.5
 #print(stimuli.head(10))
 
 ## E4 
-df = pd.merge_asof(spikes, stimuli, left_on="spike_time", right_on= "analysis_window_start")
+#df = pd.merge_asof(spikes, stimuli, left_on="spike_time", right_on= "analysis_window_start")
 #print(df.head(20))
 
 # E5 – Create a new column for relative spike time
-df["spike_time_relative_to_start"] = df["spike_time"] - df["start_time"]
+spikes["spike_time_relative_to_start"] = relative_spike_times(
+    spikes["spike_time"].to_numpy(),
+    stimuli["start_time"].to_numpy(),
+    stimuli["analysis_window_start"].to_numpy(),
+)
+df = spikes
 
 # E6 – Filter for spikes where the relative time is greater than 1 second
 df_filtered = df[df["spike_time_relative_to_start"] > 1]
@@ -82,7 +88,15 @@ plt.legend()
 # Replace "value" with the actual column you're plotting on the x-axis
 
 
-sns.histplot(data=df, x="spike_time", hue="brain_area", element="step", stat="count", common_norm=False)
+# count the spikes per brain area with numpy and draw the step histograms directly
+spike_time = df["spike_time"].to_numpy()
+codes, areas = pd.factorize(df["brain_area"])
+edges = np.linspace(spike_time.min(), spike_time.max(), 51)
+area_lines = []
+for i, area in enumerate(areas):
+    counts, _ = np.histogram(spike_time[codes == i], bins=edges)
+    area_lines.append(plt.stairs(counts, edges, label=area))
+plt.legend(handles=area_lines, title="brain_area")
 plt.title("Spike Time Distribution by Brain Area")
 plt.xlabel("Spike Time")
 plt.ylabel("Count")
@@ -0,0 +1,150 @@
+# This module is deliberately copied into each session folder so the scripts
+# there run on their own; keep download_if_stale and the session setup in sync.
+import os
+from email.utils import formatdate
+
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+# one keep-alive connection pool, shared by parallel downloads
+session = requests.Session()
+session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+
+def download_if_stale(url, fname):
+    """
+    Download the file at `url` to `fname` unless the local copy is up to date.
+    The ETag of the last download is stored in `fname + ".etag"` and sent with
+    the request, so the server only returns the file if it has changed.
+    Arguments:
+        url (str): address of the file to download.
+        fname (str): path where the downloaded file is stored.
+    """
+    etag_file = fname + ".etag"
+    headers = {}
+    if os.path.exists(fname):
+        headers["If-Modified-Since"] = formatdate(os.path.getmtime(fname), usegmt=True)
+        if os.path.exists(etag_file):
+            with open(etag_file) as file:
+                headers["If-None-Match"] = file.read().strip()
+
+    with session.get(url, headers=headers, stream=True) as response:
+        if response.status_code == 304:
+            print(f"{fname} is up to date")
+            return
+        response.raise_for_status()
+        print("Downloading Data ...")
+        with open(fname + ".part", "wb") as file:
+            for chunk in response.iter_content(chunk_size=1 << 20):
+                file.write(chunk)
+        etag = response.headers.get("ETag")
+
+    os.replace(fname + ".part", fname)
+    if etag:
+        with open(etag_file, "w") as file:
+            file.write(etag)
+    elif os.path.exists(etag_file):
+        os.remove(etag_file)
+    print("Done!")
+
+
+def relative_spike_times(spike_times, start_times, window_starts=None):
+    """
+    Get the time of every spike relative to the onset of the last stimulus before it.
+    This gives the same result as `pd.merge_asof` followed by subtracting the
+    "start_time" column, without building the merged data frame.
+    Arguments:
+        spike_times (np.ndarray): 1-dimensional array of spike times.
+        start_times (np.ndarray): 1-dimensional array of stimulus onset times, sorted like
+            the stimuli returned by `load_stimuli`.
+        window_starts (None | np.ndarray): sorted start times of the analysis windows used
+            to pair spikes with stimuli. If None, the `start_times` are used.
+    Returns:
+        (np.ndarray): 1-dimensional array of relative spike times, NaN for spikes before the first window.
+    """
+    if window_starts is None:
+        window_starts = start_times
+    idx = np.searchsorted(window_starts, spike_times, side="right") - 1
+    relative = spike_times - start_times[np.clip(idx, 0, None)]
+    return np.where(idx >= 0, relative, np.nan)
+
+
+def processed_path(fname):
+    """
+    Get the path of the feather file that `save_processed` writes next to `fname`.
+    The name is specific to this session because the sessions store different
+    dtypes and may share a working directory.
+    Arguments:
+        fname (str): path to the parquet file.
+    Returns:
+        (str): path to the feather file.
+    """
+    return os.path.splitext(fname)[0] + ".s02.feather"
+
+
+def _processed_is_fresh(fname):
+    processed = processed_path(fname)
+    return os.path.exists(processed) and (
+        not os.path.exists(fname) or os.path.getmtime(processed) >= os.path.getmtime(fname)
+    )
+
+
+def _read(fname):
+    if _processed_is_fresh(fname):
+        return pd.read_feather(processed_path(fname))
+    return pd.read_parquet(fname)
+
+
+def save_processed(
+    spikes, stimuli, spikes_fname="flash_spikes.parquet", stimuli_fname="flash_stimuli.parquet"
+):
+    """
+    Store the sorted spike and stimulus data as feather files next to the parquet files.
+    `load_spikes` and `load_stimuli` read these files instead of the parquet files
+    as long as they are newer, which skips parquet decoding and sorting.
+    Files that are already newer than their parquet file are not written again.
+    Arguments:
+        spikes (pd.DataFrame): the spike data, as returned by `load_spikes()`.
+        stimuli (pd.DataFrame): the stimulus data, as returned by `load_stimuli()`.
+        spikes_fname (str): path to the parquet file the spikes were loaded from.
+        stimuli_fname (str): path to the parquet file the stimuli were loaded from.
+    """
+    for df, fname in [(spikes, spikes_fname), (stimuli, stimuli_fname)]:
+        if not _processed_is_fresh(fname):
+            df.reset_index(drop=True).to_feather(processed_path(fname))
+
+
+def _sort_by(df, col):
+    if not df[col].is_monotonic_increasing:
+        df = df.sort_values(col, kind="mergesort").reset_index(drop=True)
+    df.attrs["sorted_by"] = col
+    return df
+
+
+def load_spikes(fname="flash_spikes.parquet"):
+    """
+    Load the spike data sorted by "spike_time".
+    Functions that search the spike times, like `np.searchsorted` or
+    `pd.merge_asof`, rely on this order, which is recorded in `.attrs["sorted_by"]`.
+    If `save_processed` stored a feather file that is newer than `fname`, it is read instead.
+    Arguments:
+        fname (str): path to the parquet file.
+    Returns:
+        (pd.DataFrame): data frame with one row per spike.
+    """
+    return _sort_by(_read(fname), "spike_time")
+
+
+def load_stimuli(fname="flash_stimuli.parquet"):
+    """
+    Load the stimulus data sorted by "start_time".
+    The order is recorded in `.attrs["sorted_by"]`.
+    If `save_processed` stored a feather file that is newer than `fname`, it is read instead.
+    Arguments:
+        fname (str): path to the parquet file.
+    Returns:
+        (pd.DataFrame): data frame with one row per stimulus presentation.
+    """
+    return _sort_by(_read(fname), "start_time")